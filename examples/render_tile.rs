@@ -1,16 +1,138 @@
 use rust_osm_renderer::data::loader::load_osm_data;
 use rust_osm_renderer::data::mmap::MappedData;
+use rust_osm_renderer::data::spatial::TileIndex;
 use rust_osm_renderer::data::types::Tile;
 use rust_osm_renderer::renderer::{VulkanRenderer, ShaderType};
+use image::RgbaImage;
+use std::collections::HashMap;
 use std::env;
+use std::error::Error;
+use std::io::{self, BufRead, Write};
 use tempfile::NamedTempFile;
 
+/// OSM data loaded into a memory-mapped tile index
+struct LoadedData {
+    tile_index: TileIndex,
+    mmap_data: MappedData,
+    // Backing file for mmap_data, must be dropped after it
+    _temp_file: NamedTempFile,
+}
+
+fn load_data(osm_path: &str) -> Result<LoadedData, Box<dyn Error>> {
+    let mut temp_file = NamedTempFile::new()?;
+    log::info!("Loading OSM data from {}...", osm_path);
+    // Index up to zoom 15, higher zooms will use parent tile data
+    let tile_index = load_osm_data(osm_path, 15, temp_file.as_file_mut())?;
+    log::info!("Loaded {} tiles", tile_index.len());
+
+    // Memory-map the data
+    let mmap_data = MappedData::new(temp_file.path())?;
+
+    Ok(LoadedData {
+        tile_index,
+        mmap_data,
+        _temp_file: temp_file,
+    })
+}
+
+/// Count non-white pixels, returning (non_white, total)
+fn count_non_white(image: &RgbaImage) -> (usize, usize) {
+    let non_white = image.pixels().filter(|p| p[0] != 255 || p[1] != 255 || p[2] != 255).count();
+    let total = (image.width() * image.height()) as usize;
+    (non_white, total)
+}
+
+fn result_line(non_white: usize, total: usize) -> String {
+    let pct = (non_white as f64 / total as f64) * 100.0;
+    format!("RESULT: {} non-white pixels / {} total ({:.1}%)", non_white, total, pct)
+}
+
+fn parse_shader_name(name: &str) -> Result<ShaderType, Box<dyn Error>> {
+    match name {
+        "mercator" => Ok(ShaderType::Mercator),
+        "simple" => Ok(ShaderType::Simple),
+        "debug" => Ok(ShaderType::Debug),
+        _ => Err(format!("unknown shader type: {}", name).into()),
+    }
+}
+
+/// Render tile jobs read from stdin, one per line:
+///
+/// `<osm-file.pbf>\t<z>\t<x>\t<y>\t<output.png>\t<mercator|simple|debug>`
+///
+/// Each job produces exactly one stdout line, either a `RESULT:` line or
+/// `ERROR: <message>`, flushed immediately so callers can stream jobs.
+/// Loaded OSM data is kept per file, and the renderer is reused while
+/// consecutive jobs share the same file and shader.
+fn run_batch() -> Result<(), Box<dyn Error>> {
+    let mut datasets: HashMap<String, LoadedData> = HashMap::new();
+    let mut renderer: Option<(String, ShaderType, VulkanRenderer)> = None;
+
+    let stdin = io::stdin();
+    let mut stdout = io::stdout();
+
+    for line in stdin.lock().lines() {
+        let line = line?;
+        if line.trim().is_empty() {
+            continue;
+        }
+
+        let outcome = (|| -> Result<String, Box<dyn Error>> {
+            let fields: Vec<&str> = line.split('\t').collect();
+            if fields.len() != 6 {
+                return Err(format!("expected 6 tab-separated fields, got {}", fields.len()).into());
+            }
+            let osm_path = fields[0];
+            let z: u32 = fields[1].parse()?;
+            let x: u32 = fields[2].parse()?;
+            let y: u32 = fields[3].parse()?;
+            let output_path = fields[4];
+            let shader_type = parse_shader_name(fields[5])?;
+
+            if !datasets.contains_key(osm_path) {
+                datasets.insert(osm_path.to_string(), load_data(osm_path)?);
+            }
+            let data = &datasets[osm_path];
+
+            let reuse = matches!(&renderer, Some((path, shader, _)) if path == osm_path && *shader == shader_type);
+            if !reuse {
+                // Drop the previous renderer before creating the next one
+                renderer = None;
+                log::info!("Creating {:?} shader renderer...", shader_type);
+                let new_renderer = VulkanRenderer::new(data.tile_index.max_points, shader_type)?;
+                renderer = Some((osm_path.to_string(), shader_type, new_renderer));
+            }
+            let (_, _, active) = renderer.as_mut().expect("renderer was just created");
+
+            log::info!("Rendering tile {}/{}/{} from {}", z, x, y, osm_path);
+            let image = active.render_tile(&Tile::new(x, y, z), &data.tile_index, &data.mmap_data)?;
+            image.save(output_path)?;
+
+            let (non_white, total) = count_non_white(&image);
+            Ok(result_line(non_white, total))
+        })();
+
+        match outcome {
+            Ok(result) => writeln!(stdout, "{}", result)?,
+            Err(e) => writeln!(stdout, "ERROR: {}", e)?,
+        }
+        stdout.flush()?;
+    }
+
+    Ok(())
+}
+
 fn main() -> Result<(), Box<dyn std::error::Error>> {
     env_logger::Builder::from_env(env_logger::Env::default().default_filter_or("info")).init();
 
     let args: Vec<String> = env::args().collect();
+    if args.iter().any(|s| s == "--batch") {
+        return run_batch();
+    }
+
     if args.len() < 5 {
         eprintln!("Usage: {} <osm-file.pbf> <z> <x> <y> [output.png] [--simple-shader|--debug-shader]", args[0]);
+        eprintln!("       {} --batch < jobs.tsv", args[0]);
         eprintln!("Example: {} prepared.osm.pbf 11 1081 660 hamburg.png", args[0]);
         std::process::exit(1);
     }
@@ -32,35 +154,26 @@ fn main() -> Result<(), Box<dyn std::error::Error>> {
     log::info!("Rendering tile {}/{}/{} from {}", z, x, y, osm_path);
 
     // Load OSM data
-    let mut temp_file = NamedTempFile::new()?;
-    log::info!("Loading OSM data...");
-    // Index up to zoom 15, higher zooms will use parent tile data
-    let tile_index = load_osm_data(osm_path, 15, temp_file.as_file_mut())?;
-    log::info!("Loaded {} tiles", tile_index.len());
-
-    // Memory-map the data
-    let mmap_data = MappedData::new(temp_file.path())?;
+    let data = load_data(osm_path)?;
 
     // Create renderer
     log::info!("Creating {:?} shader renderer...", shader_type);
-    let mut renderer = VulkanRenderer::new(tile_index.max_points, shader_type)?;
+    let mut renderer = VulkanRenderer::new(data.tile_index.max_points, shader_type)?;
 
     // Render tile
     let tile = Tile::new(x, y, z);
     log::info!("Rendering...");
-    let image = renderer.render_tile(&tile, &tile_index, &mmap_data)?;
+    let image = renderer.render_tile(&tile, &data.tile_index, &data.mmap_data)?;
 
     // Save
     image.save(output_path)?;
     log::info!("Saved to {}", output_path);
 
     // Check if it has content
-    let non_white = image.pixels().filter(|p| p[0] != 255 || p[1] != 255 || p[2] != 255).count();
-    let total = (image.width() * image.height()) as usize;
-    let pct = (non_white as f64 / total as f64) * 100.0;
+    let (non_white, total) = count_non_white(&image);
 
     println!("\n{}", "=".repeat(60));
-    println!("RESULT: {} non-white pixels / {} total ({:.1}%)", non_white, total, pct);
+    println!("{}", result_line(non_white, total));
     println!("{}", "=".repeat(60));
 
     if non_white > 100 {
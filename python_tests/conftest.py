@@ -2,10 +2,21 @@
 
 import pytest
 from pathlib import Path
-import shutil
+from contextlib import ExitStack
+from dataclasses import asdict
+import hashlib
+import json
+import os
 
-from utils.renderer import find_render_tile_binary
-from test_data.generator import generate_all_test_data
+from filelock import FileLock
+
+from utils.renderer import (
+    find_render_tile_binary,
+    RenderJob,
+    RenderResult,
+    RenderTileRunner,
+)
+from test_data import generator as fixture_generator
 
 
 @pytest.fixture(scope="session")
@@ -30,7 +41,7 @@ def render_tile_binary(project_root):
         pytest.skip: If binary is not found
     """
     try:
-        binary = find_render_tile_binary()
+        binary = find_render_tile_binary(project_root)
         return binary
     except FileNotFoundError as e:
         pytest.skip(str(e))
@@ -51,24 +62,30 @@ def golden_images_dir():
 @pytest.fixture(scope="session", autouse=True)
 def generate_test_data(test_data_dir):
     """
-    Auto-generate all test PBF files if missing.
+    Auto-generate missing test PBF files.
 
-    This runs once per test session before any tests.
-    Skips generation if fixtures already exist.
+    This runs once per test session before any tests. Only absent or empty
+    fixtures are generated. A file lock keeps concurrent xdist workers from
+    generating the same fixtures.
     """
     test_data_dir.mkdir(parents=True, exist_ok=True)
 
-    # Check if fixtures exist
-    existing_fixtures = list(test_data_dir.glob("*.pbf"))
+    with FileLock(str(test_data_dir / ".gen.lock")):
+        missing = []
+        for name in fixture_generator.GENERATORS:
+            pbf_file = test_data_dir / f"{name}.osm.pbf"
+            if not pbf_file.exists() or pbf_file.stat().st_size == 0:
+                missing.append(name)
+
+        if not missing:
+            print(f"\nFound {len(fixture_generator.GENERATORS)} existing test fixtures")
+            return
 
-    if len(existing_fixtures) == 0:
-        print("\nGenerating test data fixtures...")
+        print(f"\nGenerating {len(missing)} missing test fixtures...")
         try:
-            generate_all_test_data(test_data_dir)
+            fixture_generator.generate_missing_test_data(test_data_dir, missing)
         except Exception as e:
             pytest.fail(f"Failed to generate test data: {e}")
-    else:
-        print(f"\nFound {len(existing_fixtures)} existing test fixtures")
 
 
 @pytest.fixture
@@ -84,6 +101,226 @@ def temp_output_dir(tmp_path):
     return tmp_path
 
 
+@pytest.fixture(scope="session")
+def runner(render_tile_binary):
+    """
+    Return a RenderTileRunner shared by the whole session.
+
+    The runner starts a persistent render_tile worker on the first cache
+    miss, so renders that miss the cache don't each start a new process and
+    fully cached sessions start none.
+    """
+    with RenderTileRunner(render_tile_binary) as session_runner:
+        yield session_runner
+
+
+@pytest.fixture(scope="session")
+def analyzer_for():
+    """
+    Return ImageAnalyzer instances memoized by image path.
+
+    Repeated lookups for the same path share one decoded pixel array. Pass
+    the shared render (``rendered_tile(...).output_path``) rather than a
+    per-test copy, so tests analyzing the same tile actually hit the memo.
+
+    Returns:
+        Callable ``_analyzer(path) -> ImageAnalyzer``
+    """
+    cache = {}
+
+    def _analyzer(path):
+        # Imported lazily: numpy/PIL are only needed once an image is analyzed
+        from utils.image_comparison import ImageAnalyzer
+
+        key = str(path)
+        if key not in cache:
+            cache[key] = ImageAnalyzer(path)
+        return cache[key]
+
+    return _analyzer
+
+
+@pytest.fixture(scope="session")
+def fixture_paths(test_data_dir, generate_test_data):
+    """
+    Map each fixture name to its PBF path and whether that file exists.
+
+    Computed once, after test data generation, so tests don't stat the
+    same files over and over.
+
+    Returns:
+        Dictionary of ``{fixture_name: (pbf_path, exists)}``
+    """
+    paths = {}
+    for name in fixture_generator.GENERATORS:
+        pbf_file = test_data_dir / f"{name}.osm.pbf"
+        paths[name] = (pbf_file, pbf_file.exists())
+    return paths
+
+
+def _render_cache_dir(pytestconfig, tmp_path_factory):
+    """
+    Return the directory holding cached renders.
+
+    Renders persist across sessions in pytest's cache directory
+    (``.pytest_cache/d/renders``). With the cache provider disabled they
+    live in a per-run temp dir instead, shared by all xdist workers.
+    """
+    if getattr(pytestconfig, "cache", None) is not None:
+        return pytestconfig.cache.mkdir("renders")
+    if os.environ.get("PYTEST_XDIST_WORKER"):
+        cache_dir = tmp_path_factory.getbasetemp().parent / "render_cache"
+        cache_dir.mkdir(exist_ok=True)
+        return cache_dir
+    return tmp_path_factory.mktemp("render_cache")
+
+
+def _render_cache_key(project_root, binary, pbf_file, fixture_name, z, x, y, shader):
+    """
+    Hash a render's inputs into a cache key.
+
+    Rebuilding the binary or its shaders, or regenerating the fixture,
+    changes an mtime and so invalidates the cached render.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([fixture_name, z, x, y, shader]).encode())
+    shaders = sorted((project_root / "shaders").glob("*.spv"))
+    for path in [binary, pbf_file, *shaders]:
+        digest.update(f"{path}:{path.stat().st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def _parametrized_tiles(items):
+    """
+    Collect the (fixture_name, z, x, y, shader) tuples of parametrized items.
+
+    Args:
+        items: Collected test items
+
+    Returns:
+        Set of tile tuples, in rendered_tile's key order
+    """
+    names = ("fixture_name", "z", "x", "y", "shader")
+    tiles = set()
+    for item in items:
+        callspec = getattr(item, "callspec", None)
+        if callspec is not None and all(n in callspec.params for n in names):
+            tiles.add(tuple(callspec.params[n] for n in names))
+    return tiles
+
+
+@pytest.fixture(scope="session")
+def rendered_tile(
+    runner, fixture_paths, project_root, pytestconfig, tmp_path_factory, request
+):
+    """
+    Render tiles once and share the output between tests and sessions.
+
+    Renders are memoized by (fixture_name, z, x, y, shader), so tests that
+    ask for the same tile only invoke render_tile once. Successful renders
+    are stored on disk under a key derived from the binary, shader and
+    fixture mtimes, so reruns with unchanged inputs skip rendering
+    entirely. Each render is guarded by a per-tile file lock, so xdist
+    workers reuse each other's renders.
+
+    Tiles of the parametrized tests selected for this session are rendered
+    up front in one batch on the runner's worker.
+
+    Returns:
+        Callable ``_render(fixture_name, z, x, y, shader="mercator")
+        -> RenderResult``. The result's ``output_path`` is the shared cached
+        PNG; tests must not modify it.
+    """
+    cache_dir = _render_cache_dir(pytestconfig, tmp_path_factory)
+    cache = {}
+
+    def _cache_paths(key):
+        """Return (cached PNG, metadata JSON) paths for a tile key."""
+        fixture_name, z, x, y, shader = key
+        pbf_file, _ = fixture_paths[fixture_name]
+        digest = _render_cache_key(project_root, runner.binary_path, pbf_file, *key)
+        cached_output = (
+            cache_dir / f"{fixture_name}_z{z}_x{x}_y{y}_{shader}-{digest}.png"
+        )
+        return cached_output, cached_output.with_suffix(".json")
+
+    def _load_cached(key):
+        """Load a persisted render into the in-process cache, if present."""
+        cached_output, metadata = _cache_paths(key)
+        if not (metadata.exists() and cached_output.exists()):
+            return False
+        try:
+            fields = json.loads(metadata.read_text())
+            fields["output_path"] = Path(fields["output_path"])
+            cache[key] = RenderResult(**fields)
+        except (ValueError, TypeError, KeyError):
+            # Unreadable metadata (e.g. from an older layout): render again
+            return False
+        return True
+
+    def _prune_stale(cached_output):
+        """Delete this tile's entries left behind by older binaries or shaders."""
+        prefix, digest = cached_output.stem.rsplit("-", 1)
+        for path in cache_dir.glob(f"{prefix}-*"):
+            old_digest = path.name[len(prefix) + 1:].split(".", 1)[0]
+            if len(old_digest) == len(digest) and old_digest != digest:
+                path.unlink(missing_ok=True)
+
+    def _store(key, result):
+        """Memoize a render; only successes are persisted."""
+        if result.success:
+            cached_output, metadata = _cache_paths(key)
+            # Write then rename, so an interrupted run can't leave a
+            # truncated sidecar behind
+            partial = metadata.with_name(metadata.name + ".tmp")
+            partial.write_text(json.dumps(asdict(result), default=str))
+            os.replace(partial, metadata)
+            _prune_stale(cached_output)
+        cache[key] = result
+
+    def _lock(key):
+        cached_output, _ = _cache_paths(key)
+        return FileLock(str(cached_output) + ".lock")
+
+    # Prerender in one batch. Locks are taken in sorted order, so this can't
+    # deadlock with other workers doing the same or rendering single tiles.
+    tiles = sorted(
+        key
+        for key in _parametrized_tiles(request.session.items)
+        if fixture_paths.get(key[0], (None, False))[1]
+    )
+    with ExitStack() as stack:
+        for key in tiles:
+            stack.enter_context(_lock(key))
+        missing = [key for key in tiles if not _load_cached(key)]
+        jobs = [
+            RenderJob(fixture_paths[key[0]][0], *key[1:4], _cache_paths(key)[0], key[4])
+            for key in missing
+        ]
+        # Failed batch jobs are left uncached so _render retries them one-shot.
+        for key, result in zip(missing, runner.render_batch(jobs)):
+            if result.success:
+                _store(key, result)
+
+    def _render(fixture_name, z, x, y, shader="mercator"):
+        if fixture_name not in fixture_paths:
+            pytest.skip(f"Unknown test fixture: {fixture_name}")
+        pbf_file, exists = fixture_paths[fixture_name]
+        if not exists:
+            pytest.skip(f"Test data not found: {pbf_file}")
+
+        key = (fixture_name, z, x, y, shader)
+        if key not in cache:
+            with _lock(key):
+                if not _load_cached(key):
+                    cached_output, _ = _cache_paths(key)
+                    _store(key, runner.render(pbf_file, z, x, y, cached_output, shader))
+
+        return cache[key]
+
+    return _render
+
+
 @pytest.fixture(scope="session")
 def ensure_golden_images_dir(golden_images_dir):
     """Ensure golden images directory exists."""
@@ -114,7 +351,15 @@ def pytest_configure(config):
 def pytest_collection_modifyitems(config, items):
     """Auto-mark slow tests based on timeout."""
     for item in items:
-        # Mark tests with timeout > 5s as slow
         timeout_marker = item.get_closest_marker("timeout")
-        if timeout_marker and timeout_marker.args[0] > 5:
+        if timeout_marker is None:
+            continue
+
+        # Mark tests with timeout > 5s as slow; the timeout may be given
+        # positionally or as timeout=...
+        if timeout_marker.args:
+            timeout = timeout_marker.args[0]
+        else:
+            timeout = timeout_marker.kwargs.get("timeout")
+        if timeout is not None and timeout > 5:
             item.add_marker(pytest.mark.slow)
@@ -5,7 +5,9 @@ This script renders all test cases and saves them as golden images.
 Use this when you intentionally change rendering behavior.
 """
 
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
 # Add parent directory to path
@@ -15,17 +17,66 @@ from utils.renderer import find_render_tile_binary, RenderTileRunner
 from test_regression import TEST_CASES
 
 
+def _render_one(
+    binary,
+    test_data_dir,
+    golden_dir,
+    fixture_name,
+    z,
+    x,
+    y,
+    shader,
+    description,
+):
+    """
+    Render a single test case and save it as a golden image.
+
+    Runs in a worker process, so it must stay at module scope.
+
+    Returns:
+        (ok, fixture_name, message) tuple for progress reporting
+    """
+    pbf_file = test_data_dir / f"{fixture_name}.osm.pbf"
+    golden_path = golden_dir / f"{fixture_name}_z{z}_x{x}_y{y}_{shader}.png"
+    # Sibling of the golden image so os.replace is an atomic rename; keeps
+    # the .png extension because render_tile picks the format from it
+    temp_path = golden_path.with_name(f"{golden_path.stem}.tmp.png")
+
+    runner = RenderTileRunner(binary)
+    header = f"Rendering: {fixture_name} ({description}) - {shader}"
+    try:
+        result = runner.render(pbf_file, z, x, y, temp_path, shader)
+        if not result.success:
+            return False, fixture_name, (
+                f"{header}\n"
+                f"  ❌ FAILED\n"
+                f"     {result.stderr[:200]}"
+            )
+
+        # Move into place without copying
+        os.replace(temp_path, golden_path)
+    finally:
+        # Never leave a partial render in golden_images/, even if render
+        # raised; a no-op after a successful replace
+        temp_path.unlink(missing_ok=True)
+
+    return True, fixture_name, (
+        f"{header}\n"
+        f"  ✅ Saved: {golden_path.name}\n"
+        f"     Pixels: {result.non_white_pixels:,} / {result.total_pixels:,}\n"
+        f"     Time: {result.render_time:.3f}s"
+    )
+
+
 def main():
     """Render all test cases and save as golden images."""
     # Setup paths
     project_root = Path(__file__).parent.parent
     test_data_dir = project_root / "test_data" / "fixtures"
     golden_dir = project_root / "golden_images"
-    temp_dir = project_root / "temp_renders"
 
     # Create directories
     golden_dir.mkdir(parents=True, exist_ok=True)
-    temp_dir.mkdir(parents=True, exist_ok=True)
 
     # Find binary
     try:
@@ -39,45 +90,31 @@ def main():
     print(f"Golden images directory: {golden_dir}")
     print()
 
-    runner = RenderTileRunner(binary)
     shaders = ["mercator"]  # Match test_regression.py parametrization
 
-    success_count = 0
-    fail_count = 0
-
+    jobs = []
     for fixture_name, z, x, y, description in TEST_CASES:
         for shader in shaders:
-            pbf_file = test_data_dir / f"{fixture_name}.osm.pbf"
-            golden_path = golden_dir / f"{fixture_name}_z{z}_x{x}_y{y}_{shader}.png"
-            temp_path = temp_dir / f"{fixture_name}_{shader}.png"
-
-            if not pbf_file.exists():
+            if not (test_data_dir / f"{fixture_name}.osm.pbf").exists():
                 print(f"⚠️  SKIP: {fixture_name} - PBF not found")
                 continue
+            jobs.append((fixture_name, z, x, y, shader, description))
 
-            print(f"Rendering: {fixture_name} ({description}) - {shader}")
-
-            # Render
-            result = runner.render(pbf_file, z, x, y, temp_path, shader)
+    success_count = 0
+    fail_count = 0
 
-            if not result.success:
-                print(f"  ❌ FAILED")
-                print(f"     {result.stderr[:200]}")
+    with ProcessPoolExecutor() as executor:
+        futures = [
+            executor.submit(_render_one, binary, test_data_dir, golden_dir, *job)
+            for job in jobs
+        ]
+        for future in as_completed(futures):
+            ok, _, message = future.result()
+            print(message)
+            if ok:
+                success_count += 1
+            else:
                 fail_count += 1
-                continue
-
-            # Move to golden directory
-            import shutil
-            shutil.copy2(temp_path, golden_path)
-
-            print(f"  ✅ Saved: {golden_path.name}")
-            print(f"     Pixels: {result.non_white_pixels:,} / {result.total_pixels:,}")
-            print(f"     Time: {result.render_time:.3f}s")
-            success_count += 1
-
-    # Cleanup temp directory
-    import shutil
-    shutil.rmtree(temp_dir, ignore_errors=True)
 
     print()
     print("=" * 60)
@@ -1,7 +1,10 @@
 """Generate synthetic OSM PBF test data."""
 
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Iterable, Tuple
 import sys
+import traceback
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -154,41 +157,85 @@ def generate_boundary_cross(output_dir: Path) -> None:
     print(f"  → {output_path}")
 
 
-def generate_all_test_data(output_dir: Path) -> None:
+# Fixture name → generator, output written to ``<name>.osm.pbf``
+GENERATORS = {
+    "cross_pattern": generate_cross_pattern,
+    "horizontal_line": generate_horizontal_line,
+    "vertical_line": generate_vertical_line,
+    "diagonal_line": generate_diagonal_line,
+    "grid_pattern": generate_grid_pattern,
+    "empty_tile": generate_empty_tile,
+    "single_point": generate_single_point,
+    "boundary_cross": generate_boundary_cross,
+}
+
+
+def _run_one(job: Tuple[str, Path]) -> bool:
     """
-    Generate all test data fixtures.
+    Run a single generator in a worker process.
+
+    Errors are reported rather than raised so one failing fixture
+    doesn't cancel its siblings.
+
+    Args:
+        job: (fixture name, output directory)
+
+    Returns:
+        True if the fixture was generated
+    """
+    name, output_dir = job
+    try:
+        GENERATORS[name](output_dir)
+        return True
+    except Exception as e:
+        print(f"  ERROR: {e}")
+        traceback.print_exc()
+        return False
+
+
+def generate_missing_test_data(output_dir: Path, names: Iterable[str]) -> None:
+    """
+    Generate the named test data fixtures.
+
+    Generators are independent, so they run in parallel worker processes.
 
     Args:
         output_dir: Directory to save PBF files (typically test_data/fixtures/)
+        names: Fixture names (keys of GENERATORS) to generate
+
+    Raises:
+        RuntimeError: If any generator failed; the others still run to
+            completion first
     """
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    jobs = [(name, output_dir) for name in names]
+    if not jobs:
+        return
+
     print(f"Generating test data in {output_dir}\n")
 
-    # Generate all fixtures
-    generators = [
-        generate_cross_pattern,
-        generate_horizontal_line,
-        generate_vertical_line,
-        generate_diagonal_line,
-        generate_grid_pattern,
-        generate_empty_tile,
-        generate_single_point,
-        generate_boundary_cross,
-    ]
-
-    for generator in generators:
-        try:
-            generator(output_dir)
-        except Exception as e:
-            print(f"  ERROR: {e}")
-            import traceback
-            traceback.print_exc()
+    with ProcessPoolExecutor(max_workers=min(8, len(jobs))) as executor:
+        succeeded = list(executor.map(_run_one, jobs))
+
+    failed = [name for (name, _), ok in zip(jobs, succeeded) if not ok]
+    if failed:
+        raise RuntimeError(f"Failed to generate: {', '.join(failed)}")
 
     print(f"\nGenerated {len(list(output_dir.glob('*.pbf')))} test fixtures")
 
 
+def generate_all_test_data(output_dir: Path) -> None:
+    """
+    Generate all test data fixtures.
+
+    Args:
+        output_dir: Directory to save PBF files (typically test_data/fixtures/)
+    """
+    generate_missing_test_data(output_dir, GENERATORS)
+
+
 if __name__ == "__main__":
     # Default output directory
     default_output = Path(__file__).parent / "fixtures"
@@ -1,33 +1,40 @@
 """Threshold-based functional tests."""
 
+import numpy as np
 import pytest
-from pathlib import Path
+from PIL import Image
 
-from utils.renderer import RenderTileRunner
-from utils.image_comparison import ImageAnalyzer
+# 4x2 test image: 3 white, 2 black, 1 near-white and 2 colored pixels
+_PIXELS = [
+    [(255, 255, 255), (255, 255, 255), (0, 0, 0), (255, 0, 0)],
+    [(250, 250, 250), (0, 0, 0), (255, 255, 255), (0, 0, 255)],
+]
+
+
+def _write_png(path, pixels, mode="RGB"):
+    """Write rows of (R, G, B) tuples as a PNG in the given mode."""
+    image = Image.fromarray(np.array(pixels, dtype=np.uint8), "RGB")
+    if mode == "RGBA":
+        # Vary alpha so tests catch it leaking into color math
+        image.putalpha(Image.linear_gradient("L").resize(image.size))
+    elif mode == "P":
+        image = image.quantize()
+    image.save(path)
+    return path
 
 
 @pytest.mark.unit
 class TestGeometricPatterns:
     """Test rendering of geometric patterns with threshold validation."""
 
-    def test_cross_pattern_coverage(
-        self, render_tile_binary, test_data_dir, temp_output_dir
-    ):
+    def test_cross_pattern_coverage(self, rendered_tile, analyzer_for):
         """Cross pattern should have visible lines but not dominate the image."""
-        pbf_file = test_data_dir / "cross_pattern.osm.pbf"
-        output = temp_output_dir / "cross.png"
-
-        if not pbf_file.exists():
-            pytest.skip(f"Test data not found: {pbf_file}")
-
-        runner = RenderTileRunner(render_tile_binary)
-        result = runner.render(pbf_file, 11, 1024, 1024, output)
+        result = rendered_tile("cross_pattern", 11, 1024, 1024)
 
         assert result.success
-        assert output.exists()
+        assert result.output_path.exists()
 
-        analyzer = ImageAnalyzer(output)
+        analyzer = analyzer_for(result.output_path)
         non_white_pct = analyzer.non_white_percentage()
 
         # Cross should be visible (>0.5%) but thin (<10%)
@@ -35,22 +42,13 @@ class TestGeometricPatterns:
             f"Expected 0.5-10% non-white pixels, got {non_white_pct:.2f}%"
         )
 
-    def test_horizontal_line_coverage(
-        self, render_tile_binary, test_data_dir, temp_output_dir
-    ):
+    def test_horizontal_line_coverage(self, rendered_tile, analyzer_for):
         """Horizontal line should render with expected coverage."""
-        pbf_file = test_data_dir / "horizontal_line.osm.pbf"
-        output = temp_output_dir / "horizontal.png"
-
-        if not pbf_file.exists():
-            pytest.skip(f"Test data not found: {pbf_file}")
-
-        runner = RenderTileRunner(render_tile_binary)
-        result = runner.render(pbf_file, 10, 512, 512, output)
+        result = rendered_tile("horizontal_line", 10, 512, 512)
 
         assert result.success
 
-        analyzer = ImageAnalyzer(output)
+        analyzer = analyzer_for(result.output_path)
         non_white_pct = analyzer.non_white_percentage()
 
         # Single horizontal line should be thin
@@ -58,22 +56,13 @@ class TestGeometricPatterns:
             f"Expected 0.3-5% non-white pixels for horizontal line, got {non_white_pct:.2f}%"
         )
 
-    def test_vertical_line_coverage(
-        self, render_tile_binary, test_data_dir, temp_output_dir
-    ):
+    def test_vertical_line_coverage(self, rendered_tile, analyzer_for):
         """Vertical line should render with expected coverage."""
-        pbf_file = test_data_dir / "vertical_line.osm.pbf"
-        output = temp_output_dir / "vertical.png"
-
-        if not pbf_file.exists():
-            pytest.skip(f"Test data not found: {pbf_file}")
-
-        runner = RenderTileRunner(render_tile_binary)
-        result = runner.render(pbf_file, 10, 512, 512, output)
+        result = rendered_tile("vertical_line", 10, 512, 512)
 
         assert result.success
 
-        analyzer = ImageAnalyzer(output)
+        analyzer = analyzer_for(result.output_path)
         non_white_pct = analyzer.non_white_percentage()
 
         # Single vertical line should be thin
@@ -81,22 +70,13 @@ class TestGeometricPatterns:
             f"Expected 0.3-5% non-white pixels for vertical line, got {non_white_pct:.2f}%"
         )
 
-    def test_grid_pattern_coverage(
-        self, render_tile_binary, test_data_dir, temp_output_dir
-    ):
+    def test_grid_pattern_coverage(self, rendered_tile, analyzer_for):
         """Grid pattern should have more coverage than single line."""
-        pbf_file = test_data_dir / "grid_pattern.osm.pbf"
-        output = temp_output_dir / "grid.png"
-
-        if not pbf_file.exists():
-            pytest.skip(f"Test data not found: {pbf_file}")
-
-        runner = RenderTileRunner(render_tile_binary)
-        result = runner.render(pbf_file, 12, 2048, 2048, output)
+        result = rendered_tile("grid_pattern", 12, 2048, 2048)
 
         assert result.success
 
-        analyzer = ImageAnalyzer(output)
+        analyzer = analyzer_for(result.output_path)
         non_white_pct = analyzer.non_white_percentage()
 
         # Grid has multiple lines, should be more visible
@@ -109,61 +89,34 @@ class TestGeometricPatterns:
 class TestEdgeCases:
     """Test edge cases and boundary conditions."""
 
-    def test_empty_tile_is_white(
-        self, render_tile_binary, test_data_dir, temp_output_dir
-    ):
+    def test_empty_tile_is_white(self, rendered_tile, analyzer_for):
         """Empty tile (no ways in bbox) should render as all white."""
-        pbf_file = test_data_dir / "empty_tile.osm.pbf"
-        output = temp_output_dir / "empty.png"
-
-        if not pbf_file.exists():
-            pytest.skip(f"Test data not found: {pbf_file}")
-
-        runner = RenderTileRunner(render_tile_binary)
-        result = runner.render(pbf_file, 0, 0, 0, output)
+        result = rendered_tile("empty_tile", 0, 0, 0)
 
         assert result.success
 
-        analyzer = ImageAnalyzer(output)
+        analyzer = analyzer_for(result.output_path)
 
         # Should be all white (or very close)
         assert analyzer.is_all_white() or analyzer.non_white_percentage() < 0.1, (
             f"Empty tile should be white, got {analyzer.non_white_percentage():.2f}% non-white"
         )
 
-    def test_single_point_renders(
-        self, render_tile_binary, test_data_dir, temp_output_dir
-    ):
+    def test_single_point_renders(self, rendered_tile):
         """Degenerate line (single point) should render without crashing."""
-        pbf_file = test_data_dir / "single_point.osm.pbf"
-        output = temp_output_dir / "single_point.png"
-
-        if not pbf_file.exists():
-            pytest.skip(f"Test data not found: {pbf_file}")
-
-        runner = RenderTileRunner(render_tile_binary)
-        result = runner.render(pbf_file, 5, 16, 10, output)
+        result = rendered_tile("single_point", 5, 16, 10)
 
         # Should succeed even if output is blank
         assert result.success
-        assert output.exists()
+        assert result.output_path.exists()
 
-    def test_boundary_cross_has_content(
-        self, render_tile_binary, test_data_dir, temp_output_dir
-    ):
+    def test_boundary_cross_has_content(self, rendered_tile, analyzer_for):
         """Ways crossing tile boundaries should render visible content."""
-        pbf_file = test_data_dir / "boundary_cross.osm.pbf"
-        output = temp_output_dir / "boundary.png"
-
-        if not pbf_file.exists():
-            pytest.skip(f"Test data not found: {pbf_file}")
-
-        runner = RenderTileRunner(render_tile_binary)
-        result = runner.render(pbf_file, 10, 512, 512, output)
+        result = rendered_tile("boundary_cross", 10, 512, 512)
 
         assert result.success
 
-        analyzer = ImageAnalyzer(output)
+        analyzer = analyzer_for(result.output_path)
         non_white_count = analyzer.non_white_count()
 
         # Should have visible lines even if they extend beyond boundaries
@@ -176,27 +129,11 @@ class TestEdgeCases:
 class TestShaderVariants:
     """Test different shader types produce different outputs."""
 
-    def test_different_shaders_produce_different_output(
-        self, render_tile_binary, test_data_dir, temp_output_dir
-    ):
+    def test_different_shaders_produce_different_output(self, rendered_tile):
         """Mercator and Simple shaders should produce different outputs."""
-        pbf_file = test_data_dir / "cross_pattern.osm.pbf"
-
-        if not pbf_file.exists():
-            pytest.skip(f"Test data not found: {pbf_file}")
-
-        mercator_output = temp_output_dir / "mercator.png"
-        simple_output = temp_output_dir / "simple.png"
-
-        runner = RenderTileRunner(render_tile_binary)
-
         # Render with both shaders
-        result_mercator = runner.render(
-            pbf_file, 11, 1024, 1024, mercator_output, shader_type="mercator"
-        )
-        result_simple = runner.render(
-            pbf_file, 11, 1024, 1024, simple_output, shader_type="simple"
-        )
+        result_mercator = rendered_tile("cross_pattern", 11, 1024, 1024, "mercator")
+        result_simple = rendered_tile("cross_pattern", 11, 1024, 1024, "simple")
 
         assert result_mercator.success
         assert result_simple.success
@@ -204,7 +141,9 @@ class TestShaderVariants:
         # Compare images - they should be different
         from utils.image_comparison import compare_images_exact
 
-        comparison = compare_images_exact(mercator_output, simple_output)
+        comparison = compare_images_exact(
+            result_mercator.output_path, result_simple.output_path
+        )
 
         # Different shaders should produce different results
         # (unless the projection happens to be identical for this tile)
@@ -213,22 +152,13 @@ class TestShaderVariants:
             "Mercator and Simple shaders produced identical output - unexpected"
         )
 
-    def test_debug_shader_produces_output(
-        self, render_tile_binary, test_data_dir, temp_output_dir
-    ):
+    def test_debug_shader_produces_output(self, rendered_tile, analyzer_for):
         """Debug shader should produce visible output."""
-        pbf_file = test_data_dir / "cross_pattern.osm.pbf"
-        output = temp_output_dir / "debug.png"
-
-        if not pbf_file.exists():
-            pytest.skip(f"Test data not found: {pbf_file}")
-
-        runner = RenderTileRunner(render_tile_binary)
-        result = runner.render(pbf_file, 11, 1024, 1024, output, shader_type="debug")
+        result = rendered_tile("cross_pattern", 11, 1024, 1024, "debug")
 
         assert result.success
 
-        analyzer = ImageAnalyzer(output)
+        analyzer = analyzer_for(result.output_path)
 
         # Debug shader should produce some output
         assert analyzer.non_white_count() > 0, "Debug shader produced no visible output"
@@ -238,18 +168,9 @@ class TestShaderVariants:
 class TestPixelCounting:
     """Test pixel counting accuracy."""
 
-    def test_pixel_count_matches_analysis(
-        self, render_tile_binary, test_data_dir, temp_output_dir
-    ):
+    def test_pixel_count_matches_analysis(self, rendered_tile, analyzer_for):
         """Verify that RenderTileRunner's pixel count matches ImageAnalyzer."""
-        pbf_file = test_data_dir / "horizontal_line.osm.pbf"
-        output = temp_output_dir / "count_test.png"
-
-        if not pbf_file.exists():
-            pytest.skip(f"Test data not found: {pbf_file}")
-
-        runner = RenderTileRunner(render_tile_binary)
-        result = runner.render(pbf_file, 10, 512, 512, output)
+        result = rendered_tile("horizontal_line", 10, 512, 512)
 
         assert result.success
 
@@ -258,7 +179,7 @@ class TestPixelCounting:
         renderer_total = result.total_pixels
 
         # Get pixel count from image analysis
-        analyzer = ImageAnalyzer(output)
+        analyzer = analyzer_for(result.output_path)
         analyzer_non_white = analyzer.non_white_count()
         analyzer_total = analyzer.total_pixels
 
@@ -268,3 +189,127 @@ class TestPixelCounting:
             f"Non-white pixel count mismatch: "
             f"renderer={renderer_non_white}, analyzer={analyzer_non_white}"
         )
+
+
+@pytest.mark.unit
+class TestImageComparison:
+    """Test batch image comparison helpers."""
+
+    def test_compare_many_preserves_input_order(self, golden_images_dir):
+        """compare_many should return one result per pair, in input order."""
+        from utils.image_comparison import compare_many
+
+        cross = golden_images_dir / "cross_pattern_z11_x1024_y1024_mercator.png"
+        grid = golden_images_dir / "grid_pattern_z12_x2048_y2048_mercator.png"
+
+        results = compare_many([(cross, cross), (cross, grid)], workers=2)
+
+        assert [result.matches for result in results] == [True, False]
+        assert results[1].diff_pixels > 0
+
+    @pytest.mark.parametrize("mode", ["RGB", "RGBA", "P"])
+    def test_compare_exact_counts_and_diff_image(self, tmp_path, mode):
+        """Differing pixels beyond tolerance are counted and painted red."""
+        from utils.image_comparison import compare_images_exact
+
+        changed = [list(row) for row in _PIXELS]
+        changed[0][0] = (250, 255, 255)  # off by 5
+        changed[1][3] = (0, 0, 0)  # off by 255
+        image = _write_png(tmp_path / f"image.{mode}.png", _PIXELS, mode)
+        reference = _write_png(tmp_path / "reference.png", changed)
+        diff_path = tmp_path / "diff.png"
+
+        result = compare_images_exact(image, reference, save_diff=diff_path)
+        assert (result.matches, result.diff_pixels) == (False, 2)
+        assert result.diff_percentage == 25.0
+        assert result.diff_image_path == diff_path
+
+        expected = [list(row) for row in _PIXELS]
+        expected[0][0] = expected[1][3] = (255, 0, 0)
+        diff = np.asarray(Image.open(diff_path).convert("RGB"))
+        assert diff.tolist() == [[list(pixel) for pixel in row] for row in expected]
+
+        result = compare_images_exact(image, reference, tolerance=5)
+        assert (result.matches, result.diff_pixels) == (False, 1)
+
+        result = compare_images_exact(image, reference, tolerance=255)
+        assert (result.matches, result.diff_pixels) == (True, 0)
+
+    def test_compare_exact_ignores_alpha(self, tmp_path):
+        """RGBA and RGB encodings of the same pixels compare equal."""
+        from utils.image_comparison import compare_images_exact
+
+        rgba = _write_png(tmp_path / "rgba.png", _PIXELS, "RGBA")
+        rgb = _write_png(tmp_path / "rgb.png", _PIXELS)
+
+        result = compare_images_exact(rgba, rgb)
+        assert (result.matches, result.diff_pixels) == (True, 0)
+
+
+@pytest.mark.unit
+class TestImageAnalyzer:
+    """Test ImageAnalyzer pixel math on hand-built images."""
+
+    @pytest.fixture(params=["RGB", "RGBA", "P"])
+    def analyzer(self, request, tmp_path):
+        from utils.image_comparison import ImageAnalyzer
+
+        path = _write_png(tmp_path / "pixels.png", _PIXELS, request.param)
+        return ImageAnalyzer(path)
+
+    def test_non_white(self, analyzer):
+        """Only pure white pixels count as white."""
+        assert analyzer.total_pixels == 8
+        assert analyzer.non_white_count() == 5
+        assert analyzer.non_white_percentage() == 62.5
+        assert not analyzer.is_all_white()
+
+    def test_count_pixels_by_color(self, analyzer):
+        """Exact and tolerant category counts."""
+        assert analyzer.count_pixels_by_color() == {
+            'white': 3, 'black': 2, 'other': 3
+        }
+        assert analyzer.count_pixels_by_color(tolerance=5) == {
+            'white': 4, 'black': 2, 'other': 2
+        }
+
+    def test_color_coverage(self, analyzer):
+        """Coverage of exact, tolerant and out-of-range colors."""
+        assert analyzer.color_coverage(255, 0, 0) == 12.5
+        assert analyzer.color_coverage(255, 255, 255, tolerance=5) == 50.0
+        assert analyzer.color_coverage(0, 0, 0, tolerance=40000) == 100.0
+        # Windows that overlap 0-255 still match at the edge
+        assert analyzer.color_coverage(260, 0, 0, tolerance=5) == 12.5
+        assert analyzer.color_coverage(-1, 0, 0, tolerance=1) == 25.0
+        # Out-of-range colors can't match or leak into other channels
+        assert analyzer.color_coverage(-1, 0, 0) == 0.0
+        assert analyzer.color_coverage(256, 255, 255) == 0.0
+        assert analyzer.color_coverage(260, 255, 255, tolerance=1) == 0.0
+        assert analyzer.color_coverage(-10, 0, 0, tolerance=5) == 0.0
+
+    def test_is_all_color(self, tmp_path):
+        """Uniform images match their color, and nothing out of range."""
+        from utils.image_comparison import ImageAnalyzer
+
+        analyzer = ImageAnalyzer(_write_png(tmp_path / "white.png", [[(255,) * 3] * 4]))
+        assert analyzer.is_all_white()
+        assert analyzer.is_all_color(255, 255, 255)
+        assert analyzer.is_all_color(250, 250, 250, tolerance=5)
+        assert analyzer.is_all_color(0, 0, 0, tolerance=40000)
+        assert not analyzer.is_all_color(250, 250, 250, tolerance=4)
+        assert not analyzer.is_all_color(256, 255, 255)
+        assert not analyzer.is_all_color(260, 255, 255, tolerance=1)
+        assert analyzer.count_pixels_by_color(tolerance=40000)['white'] == 4
+
+        analyzer = ImageAnalyzer(_write_png(tmp_path / "green.png", [[(0, 1, 0)] * 4]))
+        assert not analyzer.is_all_color(256, 0, 0)
+
+    def test_dominant_color(self, analyzer, tmp_path):
+        """Most frequent color wins, ties go to the lowest color."""
+        from utils.image_comparison import ImageAnalyzer
+
+        assert analyzer.get_dominant_color() == (255, 255, 255)
+
+        tied = [[(0, 0, 255), (255, 0, 0), (255, 0, 0), (0, 0, 255)]]
+        tied_analyzer = ImageAnalyzer(_write_png(tmp_path / "tied.png", tied))
+        assert tied_analyzer.get_dominant_color() == (0, 0, 255)
@@ -2,11 +2,51 @@
 
 from PIL import Image
 import numpy as np
+import hashlib
+import mmap
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import Optional, Dict
 
 
+# Read size for hashing files on Python < 3.11 (no hashlib.file_digest)
+CHUNK_SIZE = 1 << 20
+
+# Files at least this large are hashed straight from a memory map
+MMAP_THRESHOLD = 10 * 1024 * 1024
+
+# RGBA pixels viewed as little-endian uint32: R | G << 8 | B << 16 | A << 24
+_RGB_MASK = np.uint32(0x00FFFFFF)
+_WHITE_PACKED = np.uint32(0x00FFFFFF)
+
+# Category colors as (R, G, B), and as R << 16 | G << 8 | B histogram keys
+_WHITE = (255, 255, 255)
+_BLACK = (0, 0, 0)
+_WHITE_KEY = 0xFFFFFF
+_BLACK_KEY = 0x000000
+
+# Color painted over differing pixels in diff images
+_DIFF_COLOR = np.array([255, 0, 0], dtype=np.uint8)
+_DIFF_COLOR.flags.writeable = False
+
+
+def _pack_rgb(r: int, g: int, b: int) -> Optional[np.uint32]:
+    """
+    Pack an RGB color the same way as ImageAnalyzer's uint32 pixel view.
+
+    Returns:
+        The packed color, or None if a component is outside 0-255 and so
+        can't match any pixel
+    """
+    if not (0 <= r <= 255 and 0 <= g <= 255 and 0 <= b <= 255):
+        return None
+    return np.uint32(r | g << 8 | b << 16)
+
+
 @dataclass
 class ImageComparisonResult:
     """Result of comparing two images."""
@@ -16,6 +56,51 @@ class ImageComparisonResult:
     diff_image_path: Optional[Path] = None
 
 
+def _load_rgb(path: Path) -> np.ndarray:
+    """
+    Decode an image as a read-only HxWx3 uint8 array.
+
+    RGB and RGBA images (render_tile writes RGBA) are wrapped with np.asarray
+    and the alpha channel is sliced off as a view, instead of converting to a
+    new RGB image and copying that into a fresh array.
+
+    Args:
+        path: Path to the image file
+
+    Returns:
+        HxWx3 uint8 array
+    """
+    with Image.open(path) as image:
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGB')
+        return np.asarray(image)[..., :3]
+
+
+@lru_cache(maxsize=64)
+def _load_reference_cached(path: str, mtime_ns: int, size: int) -> np.ndarray:
+    """Decode a reference image; mtime and size key out stale entries."""
+    array = _load_rgb(path)
+    array.flags.writeable = False
+    return array
+
+
+def load_reference(path: Path) -> np.ndarray:
+    """
+    Load a reference (e.g. golden) image as a read-only RGB array.
+
+    Decoded arrays are cached, so repeated comparisons against the same
+    reference only decode it once. Rewriting the file invalidates the entry.
+
+    Args:
+        path: Path to the image file
+
+    Returns:
+        HxWx3 uint8 array
+    """
+    stat = os.stat(path)
+    return _load_reference_cached(os.fspath(path), stat.st_mtime_ns, stat.st_size)
+
+
 class ImageAnalyzer:
     """Analyze image properties for threshold-based testing."""
 
@@ -26,12 +111,92 @@ class ImageAnalyzer:
         Args:
             image_path: Path to the image file
         """
-        self.image_path = Path(image_path)
-        self.image = Image.open(image_path).convert('RGB')
-        self.array = np.array(self.image)
+        self.image_path = (
+            image_path if isinstance(image_path, Path) else Path(image_path)
+        )
+        rgba_image = Image.open(image_path)
+        if rgba_image.mode != 'RGBA':
+            rgba_image = rgba_image.convert('RGBA')
+        # Decode once into a writable RGBA buffer; array is its RGB view
+        self._rgba = np.array(rgba_image)
+        self.array = self._rgba[..., :3]
         self.height, self.width, _ = self.array.shape
         self.total_pixels = self.height * self.width
 
+        # One uint32 per pixel with alpha masked off, so testing for white
+        # is a single compare instead of three
+        self._packed = self._rgba.view('<u4').reshape(-1) & _RGB_MASK
+
+    @cached_property
+    def image(self) -> Image.Image:
+        """The image converted to RGB, loaded on first access."""
+        return Image.open(self.image_path).convert('RGB')
+
+    @cached_property
+    def _white_mask(self) -> np.ndarray:
+        """Flat mask of pure white pixels, shared by the white/non-white queries."""
+        return self._packed == _WHITE_PACKED
+
+    @cached_property
+    def _histogram(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sparse color histogram as sorted (keys, counts) arrays.
+
+        Keys are packed R << 16 | G << 8 | B, so sorted keys order colors the
+        same way as (R, G, B) rows. Sorting 1-D uint32 keys is far cheaper
+        than np.unique(axis=0), and a dense 2**24 bincount would allocate
+        128 MiB per image.
+        """
+        packed = self._packed
+        keys = (packed & 0xFF) << 16 | (packed & 0xFF00) | (packed >> 16)
+        return np.unique(keys, return_counts=True)
+
+    def _histogram_count(self, key: int) -> int:
+        """Number of pixels whose packed R << 16 | G << 8 | B equals key."""
+        keys, counts = self._histogram
+        idx = int(np.searchsorted(keys, key))
+        if idx < len(keys) and keys[idx] == key:
+            return int(counts[idx])
+        return 0
+
+    @cached_property
+    def _non_white_count(self) -> int:
+        """Number of pixels that are not pure white."""
+        return self.total_pixels - int(np.count_nonzero(self._white_mask))
+
+    def _color_mask(self, r: int, g: int, b: int, tolerance: int) -> np.ndarray:
+        """
+        Mask of pixels within tolerance of a color, computed in uint8.
+
+        Works one channel at a time into preallocated HxW buffers, so no
+        HxWx3 temporaries are created and nothing is upcast from uint8. Each
+        channel needs one subtract and one compare: subtracting the lower
+        bound wraps values below it around to large numbers, so a single
+        unsigned `<= hi - lo` checks both ends of the range.
+
+        Args:
+            r, g, b: Target RGB color
+            tolerance: Allowed deviation per channel
+
+        Returns:
+            HxW boolean mask
+        """
+        # Bounds as Python ints, so large tolerances can't overflow. A
+        # channel whose window lies entirely outside 0-255 matches nothing.
+        bounds = [(c - tolerance, c + tolerance) for c in (r, g, b)]
+        if tolerance < 0 or any(hi < 0 or lo > 255 for lo, hi in bounds):
+            return np.zeros((self.height, self.width), dtype=bool)
+
+        mask = np.ones((self.height, self.width), dtype=bool)
+        shifted = np.empty((self.height, self.width), dtype=np.uint8)
+        in_range = np.empty((self.height, self.width), dtype=bool)
+        for channel, (lo, hi) in enumerate(bounds):
+            lo, hi = max(lo, 0), min(hi, 255)
+            np.subtract(self.array[..., channel], np.uint8(lo), out=shifted)
+            np.less_equal(shifted, np.uint8(hi - lo), out=in_range)
+            mask &= in_range
+        return mask
+
     def non_white_percentage(self) -> float:
         """
         Calculate percentage of non-white pixels.
@@ -39,9 +204,7 @@ class ImageAnalyzer:
         Returns:
             Percentage (0-100) of pixels that are not pure white (255,255,255)
         """
-        white_mask = np.all(self.array == [255, 255, 255], axis=2)
-        non_white_count = np.sum(~white_mask)
-        return (non_white_count / self.total_pixels) * 100.0
+        return (self.non_white_count() / self.total_pixels) * 100.0
 
     def non_white_count(self) -> int:
         """
@@ -50,8 +213,7 @@ class ImageAnalyzer:
         Returns:
             Number of pixels that are not pure white
         """
-        white_mask = np.all(self.array == [255, 255, 255], axis=2)
-        return int(np.sum(~white_mask))
+        return self._non_white_count
 
     def is_all_white(self) -> bool:
         """
@@ -60,7 +222,7 @@ class ImageAnalyzer:
         Returns:
             True if all pixels are (255,255,255)
         """
-        return np.all(self.array == 255)
+        return self.non_white_count() == 0
 
     def is_all_color(self, r: int, g: int, b: int, tolerance: int = 0) -> bool:
         """
@@ -73,8 +235,10 @@ class ImageAnalyzer:
         Returns:
             True if all pixels match the color within tolerance
         """
-        diff = np.abs(self.array.astype(int) - np.array([r, g, b]))
-        return np.all(diff <= tolerance)
+        if tolerance == 0:
+            packed = _pack_rgb(r, g, b)
+            return packed is not None and bool(np.all(self._packed == packed))
+        return bool(np.all(self._color_mask(r, g, b, tolerance)))
 
     def count_pixels_by_color(self, tolerance: int = 0) -> Dict[str, int]:
         """
@@ -88,13 +252,20 @@ class ImageAnalyzer:
         """
         counts = {}
 
+        if tolerance == 0:
+            # Both categories come from one pass over the image
+            counts['white'] = self._histogram_count(_WHITE_KEY)
+            counts['black'] = self._histogram_count(_BLACK_KEY)
+            counts['other'] = self.total_pixels - counts['white'] - counts['black']
+            return counts
+
         # Check for white (255,255,255)
-        white_mask = np.all(np.abs(self.array - [255, 255, 255]) <= tolerance, axis=2)
-        counts['white'] = int(np.sum(white_mask))
+        white_mask = self._color_mask(*_WHITE, tolerance)
+        counts['white'] = int(np.count_nonzero(white_mask))
 
         # Check for black (0,0,0)
-        black_mask = np.all(np.abs(self.array - [0, 0, 0]) <= tolerance, axis=2)
-        counts['black'] = int(np.sum(black_mask))
+        black_mask = self._color_mask(*_BLACK, tolerance)
+        counts['black'] = int(np.count_nonzero(black_mask))
 
         # Everything else
         counts['other'] = self.total_pixels - counts['white'] - counts['black']
@@ -108,15 +279,10 @@ class ImageAnalyzer:
         Returns:
             (R, G, B) tuple of the most frequent color
         """
-        # Reshape to list of pixels
-        pixels = self.array.reshape(-1, 3)
-
-        # Find unique colors and their counts
-        unique_colors, counts = np.unique(pixels, axis=0, return_counts=True)
-
-        # Get most common
-        dominant_idx = np.argmax(counts)
-        return tuple(unique_colors[dominant_idx])
+        # argmax returns the first maximum, so ties pick the lowest color
+        keys, counts = self._histogram
+        key = int(keys[np.argmax(counts)])
+        return (key >> 16, (key >> 8) & 0xFF, key & 0xFF)
 
     def color_coverage(self, r: int, g: int, b: int, tolerance: int = 0) -> float:
         """
@@ -129,11 +295,45 @@ class ImageAnalyzer:
         Returns:
             Percentage (0-100) of pixels matching the color
         """
-        color_mask = np.all(np.abs(self.array - [r, g, b]) <= tolerance, axis=2)
-        matching_count = np.sum(color_mask)
+        if tolerance == 0:
+            packed = _pack_rgb(r, g, b)
+            matching_count = (
+                0 if packed is None else np.count_nonzero(self._packed == packed)
+            )
+        else:
+            color_mask = self._color_mask(r, g, b, tolerance)
+            matching_count = np.count_nonzero(color_mask)
         return (matching_count / self.total_pixels) * 100.0
 
 
+def _diff_mask(img1: np.ndarray, img2: np.ndarray, tolerance: int) -> np.ndarray:
+    """
+    Mask of pixels where any channel differs by more than tolerance.
+
+    Works one channel at a time into preallocated HxW uint8 buffers: the
+    absolute difference is max - min (which cannot wrap), folded into a
+    running per-pixel maximum, so no HxWx3 temporaries are created.
+
+    Args:
+        img1: HxWx3 uint8 array
+        img2: HxWx3 uint8 array of the same shape
+        tolerance: Allowed RGB difference per channel
+
+    Returns:
+        HxW boolean mask
+    """
+    height, width, _ = img1.shape
+    max_diff = np.zeros((height, width), dtype=np.uint8)
+    high = np.empty((height, width), dtype=np.uint8)
+    low = np.empty((height, width), dtype=np.uint8)
+    for channel in range(3):
+        np.maximum(img1[..., channel], img2[..., channel], out=high)
+        np.minimum(img1[..., channel], img2[..., channel], out=low)
+        np.subtract(high, low, out=high)
+        np.maximum(max_diff, high, out=max_diff)
+    return max_diff > tolerance
+
+
 def compare_images_exact(
     image1_path: Path,
     image2_path: Path,
@@ -145,7 +345,7 @@ def compare_images_exact(
 
     Args:
         image1_path: Path to first image
-        image2_path: Path to second image
+        image2_path: Path to reference image (decoded once and cached)
         tolerance: Allowed RGB difference per channel (0 = exact match)
         save_diff: Optional path to save visual diff image
 
@@ -153,8 +353,8 @@ def compare_images_exact(
         ImageComparisonResult with comparison details
     """
     # Load images as RGB
-    img1 = np.array(Image.open(image1_path).convert('RGB'))
-    img2 = np.array(Image.open(image2_path).convert('RGB'))
+    img1 = _load_rgb(image1_path)
+    img2 = load_reference(image2_path)
 
     # Check dimensions match
     if img1.shape != img2.shape:
@@ -166,36 +366,78 @@ def compare_images_exact(
             diff_percentage=100.0,
         )
 
-    # Calculate per-pixel absolute difference
-    diff = np.abs(img1.astype(int) - img2.astype(int))
+    # Fast path: identical images match at any tolerance and need no diff
+    # mask or diff image, so nothing beyond the equality check is allocated
+    if np.array_equal(img1, img2):
+        return ImageComparisonResult(
+            matches=True,
+            diff_pixels=0,
+            diff_percentage=0.0,
+        )
 
     # Pixels that differ by more than tolerance in any channel
-    diff_mask = np.any(diff > tolerance, axis=2)
-    diff_pixels = int(np.sum(diff_mask))
+    diff_mask = _diff_mask(img1, img2, tolerance)
+    diff_pixels = int(np.count_nonzero(diff_mask))
+
+    # All differences within tolerance
+    if diff_pixels == 0:
+        return ImageComparisonResult(
+            matches=True,
+            diff_pixels=0,
+            diff_percentage=0.0,
+        )
 
     total_pixels = img1.shape[0] * img1.shape[1]
     diff_percentage = (diff_pixels / total_pixels) * 100.0
 
-    matches = diff_pixels == 0
-
     # Optionally save visual diff
     diff_image_path = None
-    if save_diff and diff_pixels > 0:
+    if save_diff:
         # Create diff image: red where different, original where same
         diff_visual = img1.copy()
-        diff_visual[diff_mask] = [255, 0, 0]  # Red for differences
+        # Red for differences; a masked copy skips materializing indices
+        np.copyto(diff_visual, _DIFF_COLOR, where=diff_mask[..., None])
 
-        Image.fromarray(diff_visual.astype(np.uint8)).save(save_diff)
+        Image.fromarray(diff_visual).save(save_diff)
         diff_image_path = save_diff
 
     return ImageComparisonResult(
-        matches=matches,
+        matches=False,
         diff_pixels=diff_pixels,
         diff_percentage=diff_percentage,
         diff_image_path=diff_image_path,
     )
 
 
+def compare_many(
+    pairs: list[tuple[Path, Path]],
+    tolerance: int = 0,
+    workers: Optional[int] = None,
+) -> list[ImageComparisonResult]:
+    """
+    Compare many image pairs concurrently with compare_images_exact.
+
+    PNG decoding and the NumPy comparisons release the GIL, so a thread pool
+    scales across tiles without the pickling cost of processes.
+
+    Args:
+        pairs: (image, reference) path pairs
+        tolerance: Allowed RGB difference per channel (0 = exact match)
+        workers: Number of threads (defaults to the CPU count)
+
+    Returns:
+        One ImageComparisonResult per pair, in input order
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(
+            lambda pair: compare_images_exact(*pair, tolerance=tolerance),
+            pairs,
+        ))
+
+
 def compare_images_hash(image1_path: Path, image2_path: Path) -> bool:
     """
     Fast comparison using file hash (byte-identical check).
@@ -207,14 +449,27 @@ def compare_images_hash(image1_path: Path, image2_path: Path) -> bool:
     Returns:
         True if images are byte-identical
     """
-    import hashlib
-
     def file_hash(path: Path) -> str:
-        """Compute SHA256 hash of file."""
-        sha256 = hashlib.sha256()
+        """Compute BLAKE2b hash of file (faster than SHA-256 on 64-bit CPUs)."""
         with open(path, 'rb') as f:
-            while chunk := f.read(8192):
-                sha256.update(chunk)
-        return sha256.hexdigest()
+            if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        return hashlib.blake2b(mm).hexdigest()
+                except (OSError, ValueError):
+                    pass  # mmap unavailable; fall back to reading
+
+            if sys.version_info >= (3, 11):
+                # Runs the read/update loop in C
+                return hashlib.file_digest(f, "blake2b").hexdigest()
+
+            digest = hashlib.blake2b()
+            while chunk := f.read(CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    # Files of different size can never be byte-identical
+    if os.path.getsize(image1_path) != os.path.getsize(image2_path):
+        return False
 
     return file_hash(image1_path) == file_hash(image2_path)
@@ -1,16 +1,27 @@
 """OSM data builder for creating synthetic test fixtures."""
 
-import subprocess
 import math
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple, Dict, Optional
-import xml.etree.ElementTree as ET
+from typing import Iterator, List, Tuple, Dict, Optional
+from xml.sax.saxutils import escape
 
 
+# Buffer size for writing OSM XML
+XML_WRITE_BUFFER = 256 * 1024
+
+# Characters ElementTree escapes in attribute values, on top of & < >
+_XML_ATTR_ENTITIES = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#09;"}
+
+
+@lru_cache(maxsize=1024)
 def tile_to_bbox(x: int, y: int, z: int) -> Tuple[float, float, float, float]:
     """
     Convert tile coordinates to lat/lon bounding box using Web Mercator.
 
+    Results are memoized; the returned tuple is immutable, so sharing it
+    between callers is safe.
+
     Args:
         x: Tile X coordinate
         y: Tile Y coordinate
@@ -87,6 +98,48 @@ class OSMBuilder:
         # Create way
         return self._add_way([n1, n2], tags)
 
+    def add_lines(
+        self,
+        lines: List[Tuple[float, float, float, float]],
+        tags: Optional[Dict[str, str]] = None,
+    ) -> List[int]:
+        """
+        Add many 2-point line ways at once.
+
+        Produces the same nodes, ways and IDs as calling add_line for each
+        line, but extends the node and way lists in one step each.
+
+        Args:
+            lines: List of (start_lat, start_lon, end_lat, end_lon) tuples
+            tags: Optional tags for every way (default: highway=primary)
+
+        Returns:
+            Way IDs, in input order
+        """
+        if tags is None:
+            tags = {"highway": "primary"}
+
+        first_node = self.node_id
+        first_way = self.way_id
+
+        self.nodes.extend(
+            node
+            for i, (start_lat, start_lon, end_lat, end_lon) in enumerate(lines)
+            for node in (
+                (first_node + 2 * i, start_lat, start_lon),
+                (first_node + 2 * i + 1, end_lat, end_lon),
+            )
+        )
+        way_ids = list(range(first_way, first_way + len(lines)))
+        self.ways.extend(
+            (way_id, [first_node + 2 * i, first_node + 2 * i + 1], dict(tags))
+            for i, way_id in enumerate(way_ids)
+        )
+
+        self.node_id += 2 * len(lines)
+        self.way_id += len(lines)
+        return way_ids
+
     def add_polyline(
         self,
         points: List[Tuple[float, float]],
@@ -131,39 +184,53 @@ class OSMBuilder:
         """
         Generate OSM XML file.
 
+        The schema is fixed, so elements are formatted straight into the file
+        instead of building an ElementTree first. The output is identical to
+        ElementTree's indented serialization.
+
         Args:
             output_path: Where to save the XML file
         """
-        # Create root OSM element
-        osm = ET.Element("osm", version="0.6", generator="OSMBuilder")
+        with open(
+            output_path, "w", encoding="utf-8", buffering=XML_WRITE_BUFFER
+        ) as f:
+            f.writelines(self._xml_lines())
+
+    def _xml_lines(self) -> Iterator[str]:
+        """Yield the OSM XML document line by line."""
+        yield "<?xml version='1.0' encoding='utf-8'?>\n"
+
+        if not self.nodes and not self.ways:
+            yield '<osm version="0.6" generator="OSMBuilder" />'
+            return
+
+        yield '<osm version="0.6" generator="OSMBuilder">\n'
 
         # Add all nodes
         for node_id, lat, lon in self.nodes:
-            ET.SubElement(
-                osm,
-                "node",
-                id=str(node_id),
-                lat=str(lat),
-                lon=str(lon),
-                version="1",
-            )
+            yield f'  <node id="{node_id}" lat="{lat}" lon="{lon}" version="1" />\n'
 
         # Add all ways
         for way_id, node_ids, tags in self.ways:
-            way_elem = ET.SubElement(osm, "way", id=str(way_id), version="1")
+            if not node_ids and not tags:
+                yield f'  <way id="{way_id}" version="1" />\n'
+                continue
+
+            yield f'  <way id="{way_id}" version="1">\n'
 
             # Add node references
             for node_id in node_ids:
-                ET.SubElement(way_elem, "nd", ref=str(node_id))
+                yield f'    <nd ref="{node_id}" />\n'
 
             # Add tags
             for key, value in tags.items():
-                ET.SubElement(way_elem, "tag", k=key, v=value)
+                key = escape(key, _XML_ATTR_ENTITIES)
+                value = escape(value, _XML_ATTR_ENTITIES)
+                yield f'    <tag k="{key}" v="{value}" />\n'
+
+            yield "  </way>\n"
 
-        # Write to file with pretty formatting
-        tree = ET.ElementTree(osm)
-        ET.indent(tree, space="  ")
-        tree.write(output_path, encoding="utf-8", xml_declaration=True)
+        yield "</osm>"
 
     def build_to_pbf(
         self,
@@ -174,63 +241,44 @@ class OSMBuilder:
         """
         Generate OSM PBF file with embedded node locations.
 
-        Uses osmium CLI tools to convert XML → PBF and add locations.
+        The OSM XML is parsed from memory and written as PBF with locations
+        on ways in a single pass through pyosmium, matching what
+        `osmium cat` followed by `osmium add-locations-to-ways` produced
+        (untagged nodes are dropped) without temporary files or
+        subprocesses.
 
         Args:
             output_path: Where to save the final PBF file
-            temp_dir: Optional directory for temporary files
-            keep_xml: Keep the intermediate XML file
+            temp_dir: Directory for the XML file when keep_xml is set
+                (default: next to output_path)
+            keep_xml: Also write the OSM XML to disk
 
         Raises:
-            FileNotFoundError: If osmium is not installed
-            subprocess.CalledProcessError: If conversion fails
+            ImportError: If pyosmium is not installed
+            RuntimeError: If osmium fails to convert the data
         """
-        # Determine temp directory
-        if temp_dir is None:
-            temp_dir = output_path.parent
-
-        temp_dir.mkdir(parents=True, exist_ok=True)
-
-        # Generate intermediate files
-        xml_path = temp_dir / f"{output_path.stem}_temp.osm.xml"
-        pbf_temp_path = temp_dir / f"{output_path.stem}_temp.osm.pbf"
-
-        try:
-            # Step 1: Write OSM XML
-            self.build_to_xml(xml_path)
-
-            # Step 2: Convert XML to PBF
-            subprocess.run(
-                ["osmium", "cat", str(xml_path), "-o", str(pbf_temp_path)],
-                check=True,
-                capture_output=True,
-                text=True,
-            )
+        import osmium
 
-            # Step 3: Add node locations to ways
-            subprocess.run(
-                [
-                    "osmium",
-                    "add-locations-to-ways",
-                    str(pbf_temp_path),
-                    "-o",
-                    str(output_path),
-                ],
-                check=True,
-                capture_output=True,
-                text=True,
-            )
+        xml_data = "".join(self._xml_lines()).encode("utf-8")
 
-        except FileNotFoundError:
-            raise FileNotFoundError(
-                "osmium command not found. Install with: sudo apt-get install osmium-tool"
-            )
-        finally:
-            # Cleanup temporary files
-            if not keep_xml and xml_path.exists():
-                xml_path.unlink()
-            if pbf_temp_path.exists():
-                pbf_temp_path.unlink()
+        if keep_xml:
+            if temp_dir is None:
+                temp_dir = output_path.parent
+            temp_dir.mkdir(parents=True, exist_ok=True)
+            (temp_dir / f"{output_path.stem}_temp.osm.xml").write_bytes(xml_data)
+
+        objects = osmium.FileProcessor(
+            osmium.io.FileBuffer(xml_data, "osm")
+        ).with_locations()
+        output = osmium.io.File(str(output_path), "pbf,locations_on_ways=true")
+
+        with osmium.SimpleWriter(output, overwrite=True) as writer:
+            for obj in objects:
+                # Way nodes carry their locations; standalone untagged nodes
+                # are redundant, as with add-locations-to-ways
+                if obj.is_node() and not obj.tags:
+                    continue
+                writer.add(obj)
 
 
 def create_cross_pattern(tile_x: int, tile_y: int, tile_z: int) -> OSMBuilder:
@@ -300,14 +348,14 @@ def create_grid_pattern(
     # Get tile bounding box
     lon_min, lat_min, lon_max, lat_max = tile_to_bbox(tile_x, tile_y, tile_z)
 
-    # Add horizontal lines
-    for i in range(rows):
-        lat = lat_min + (lat_max - lat_min) * (i + 1) / (rows + 1)
-        builder.add_line(lat, lon_min, lat, lon_max)
+    # Evenly spaced interior lines (the bbox edges themselves are skipped)
+    lats = [lat_min + (lat_max - lat_min) * (i + 1) / (rows + 1) for i in range(rows)]
+    lons = [lon_min + (lon_max - lon_min) * (i + 1) / (cols + 1) for i in range(cols)]
 
-    # Add vertical lines
-    for i in range(cols):
-        lon = lon_min + (lon_max - lon_min) * (i + 1) / (cols + 1)
-        builder.add_line(lat_min, lon, lat_max, lon)
+    # Horizontal lines first, then vertical lines
+    builder.add_lines(
+        [(lat, lon_min, lat, lon_max) for lat in lats]
+        + [(lat_min, lon, lat_max, lon) for lon in lons]
+    )
 
     return builder
@@ -1,11 +1,19 @@
 """Wrapper for executing the render_tile binary."""
 
+import functools
+import queue
 import subprocess
+import threading
 import time
 import re
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
+
+
+# Pixel count line printed by render_tile, e.g.
+# "RESULT: 1523 non-white pixels / 65536 total (2.3%)"
+_RESULT_PATTERN = re.compile(r"RESULT:\s+(\d+)\s+non-white pixels\s+/\s+(\d+)\s+total")
 
 
 @dataclass
@@ -20,8 +28,40 @@ class RenderResult:
     total_pixels: int
 
 
+@dataclass
+class RenderJob:
+    """A tile to render as part of a batch."""
+    osm_file: Path
+    z: int
+    x: int
+    y: int
+    output_path: Path
+    shader_type: str = "mercator"
+
+
+def _pump(stream, sink) -> None:
+    """Forward lines from a worker pipe to sink, then None at EOF."""
+    for line in stream:
+        sink(line)
+    sink(None)
+
+
+def _job_line(job: RenderJob) -> str:
+    """Format a job as a ``render_tile --batch`` stdin line."""
+    fields = (job.osm_file, job.z, job.x, job.y, job.output_path, job.shader_type)
+    return "\t".join(str(field) for field in fields) + "\n"
+
+
 class RenderTileRunner:
-    """Execute the render_tile binary and parse results."""
+    """
+    Execute the render_tile binary and parse results.
+
+    Used as a context manager, the runner starts one ``render_tile --batch``
+    process on the first render and streams render() and render_batch()
+    calls to it, so process startup and OSM loading are paid once per file
+    instead of once per tile. Worker mode is not thread-safe; share a runner
+    only within one thread.
+    """
 
     def __init__(self, binary_path: Path):
         """
@@ -39,6 +79,172 @@ class RenderTileRunner:
                 f"render_tile binary not found: {binary_path}\n"
                 f"Run: cargo build --example render_tile"
             )
+        self._worker: Optional[subprocess.Popen] = None
+        self._start_on_demand = False
+
+    def __enter__(self) -> "RenderTileRunner":
+        # Runs that never render (e.g. fully cached) don't spawn a worker
+        self._start_on_demand = True
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def start_worker(self) -> None:
+        """Start the persistent render_tile worker, if not running already."""
+        self._start_on_demand = False
+        if self._worker is not None:
+            return
+
+        self._worker = subprocess.Popen(
+            [str(self.binary_path), "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            cwd=self._project_root,
+        )
+        # Drain both pipes on threads: stdout so reads can time out, stderr
+        # so the worker's log can't fill the pipe and block it
+        self._worker_lines: queue.Queue = queue.Queue()
+        self._worker_log: queue.Queue = queue.Queue()
+        for stream, sink in (
+            (self._worker.stdout, self._worker_lines.put),
+            (self._worker.stderr, self._worker_log.put),
+        ):
+            threading.Thread(target=_pump, args=(stream, sink), daemon=True).start()
+
+    def close(self) -> None:
+        """Stop the persistent worker; later renders run one-shot."""
+        self._start_on_demand = False
+        worker, self._worker = self._worker, None
+        if worker is None:
+            return
+
+        try:
+            worker.stdin.close()
+        except OSError:
+            pass  # Worker already exited
+        try:
+            worker.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            worker.kill()
+            worker.wait()
+
+    def _next_worker_line(self, deadline: float, timeout: int) -> Optional[str]:
+        """
+        Wait for the worker's next RESULT:/ERROR: line, skipping other output.
+
+        Args:
+            deadline: time.perf_counter() value to give up at
+            timeout: Timeout to report if the deadline passes
+
+        Returns:
+            The line, or None if the worker exited (it is closed)
+
+        Raises:
+            subprocess.TimeoutExpired: If no line arrives before the deadline;
+                the worker is killed
+        """
+        worker = self._worker
+        while True:
+            try:
+                line = self._worker_lines.get(
+                    timeout=max(deadline - time.perf_counter(), 0)
+                )
+            except queue.Empty:
+                worker.kill()
+                self.close()
+                raise subprocess.TimeoutExpired(worker.args, timeout)
+            if line is None:
+                self.close()
+                return None
+            line = line.rstrip("\n")
+            if line.startswith(("RESULT:", "ERROR:")):
+                return line
+
+    def _drain_worker_log(self) -> str:
+        """Return the log lines the worker has written since the last drain."""
+        log = []
+        while True:
+            try:
+                entry = self._worker_log.get_nowait()
+            except queue.Empty:
+                break
+            if entry is not None:
+                log.append(entry)
+        return "".join(log)
+
+    def _batch_in_worker(
+        self, jobs: List[RenderJob], timeout: int
+    ) -> tuple[List[str], str]:
+        """
+        Stream jobs through the persistent worker.
+
+        Returns:
+            (RESULT:/ERROR: lines in job order, worker log). If the worker
+            dies, the lines stop at the last job it answered.
+
+        Raises:
+            subprocess.TimeoutExpired: If the jobs take longer than timeout;
+                the worker is killed
+        """
+        deadline = time.perf_counter() + timeout
+        try:
+            self._worker.stdin.write("".join(_job_line(job) for job in jobs))
+            self._worker.stdin.flush()
+        except OSError:
+            self.close()
+            return [], ""
+
+        lines = []
+        while len(lines) < len(jobs):
+            line = self._next_worker_line(deadline, timeout)
+            if line is None:
+                break
+            lines.append(line)
+        return lines, self._drain_worker_log()
+
+    def _render_in_worker(self, job: RenderJob, timeout: int) -> Optional[RenderResult]:
+        """
+        Render one job on the persistent worker.
+
+        Returns:
+            The RenderResult, or None if the worker died before answering
+            (the caller then falls back to a one-shot render)
+
+        Raises:
+            subprocess.TimeoutExpired: If the worker doesn't answer in time;
+                the worker is killed
+        """
+        worker = self._worker
+        start = time.perf_counter()
+        try:
+            worker.stdin.write(_job_line(job))
+            worker.stdin.flush()
+        except OSError:
+            self.close()
+            return None
+
+        line = self._next_worker_line(start + timeout, timeout)
+        if line is None:
+            return None
+        elapsed = time.perf_counter() - start
+
+        non_white, total = self._parse_pixel_counts(line)
+        output_path = job.output_path
+        return RenderResult(
+            success=line.startswith("RESULT:"),
+            output_path=(
+                output_path if isinstance(output_path, Path) else Path(output_path)
+            ),
+            stdout=line,
+            stderr=self._drain_worker_log(),
+            render_time=elapsed,
+            non_white_pixels=non_white,
+            total_pixels=total,
+        )
 
     def render(
         self,
@@ -53,6 +259,11 @@ class RenderTileRunner:
         """
         Render a tile using the render_tile binary.
 
+        Runs on the persistent worker when one is running (see
+        start_worker, or use the runner as a context manager), otherwise in
+        a new render_tile process. If the worker dies, this render and later
+        ones fall back to one-shot processes.
+
         Args:
             osm_file: Path to the OSM PBF file
             z: Zoom level
@@ -68,6 +279,14 @@ class RenderTileRunner:
         Raises:
             subprocess.TimeoutExpired: If rendering takes longer than timeout
         """
+        if self._start_on_demand:
+            self.start_worker()
+        if self._worker is not None:
+            job = RenderJob(osm_file, z, x, y, output_path, shader_type)
+            result = self._render_in_worker(job, timeout)
+            if result is not None:
+                return result
+
         # Build command
         cmd = [
             str(self.binary_path),
@@ -86,15 +305,13 @@ class RenderTileRunner:
         # mercator is default, no flag needed
 
         # Execute and measure time
-        # Run from project root so shader files can be found
-        project_root = self.binary_path.parent.parent.parent.parent
         start = time.perf_counter()
         result = subprocess.run(
             cmd,
             capture_output=True,
             text=True,
             timeout=timeout,
-            cwd=project_root,
+            cwd=self._project_root,
         )
         elapsed = time.perf_counter() - start
 
@@ -103,7 +320,9 @@ class RenderTileRunner:
 
         return RenderResult(
             success=result.returncode == 0,
-            output_path=Path(output_path),
+            output_path=(
+                output_path if isinstance(output_path, Path) else Path(output_path)
+            ),
             stdout=result.stdout,
             stderr=result.stderr,
             render_time=elapsed,
@@ -111,6 +330,91 @@ class RenderTileRunner:
             total_pixels=total,
         )
 
+    def render_batch(
+        self,
+        jobs: List[RenderJob],
+        timeout: int = 30,
+    ) -> List[RenderResult]:
+        """
+        Render several tiles in a single render_tile process.
+
+        Jobs are streamed to the persistent worker when one is running,
+        otherwise to a new ``render_tile --batch`` process. Either way each
+        OSM file is loaded once and its renderer reused across consecutive
+        jobs with the same file and shader. Jobs are sent grouped that way;
+        results come back in the order of ``jobs``. Jobs left unanswered
+        because the process exited are returned as failures.
+
+        Args:
+            jobs: Tiles to render
+            timeout: Maximum seconds to wait per job
+
+        Returns:
+            One RenderResult per job. ``stdout`` holds the job's own result
+            line, ``stderr`` the log of the whole batch, and ``render_time``
+            the batch wall time averaged over its jobs.
+
+        Raises:
+            subprocess.TimeoutExpired: If the batch takes longer than
+                ``timeout`` seconds per job
+        """
+        if not jobs:
+            return []
+
+        order = sorted(
+            range(len(jobs)),
+            key=lambda i: (str(jobs[i].osm_file), jobs[i].shader_type),
+        )
+        ordered = [jobs[i] for i in order]
+
+        if self._start_on_demand:
+            self.start_worker()
+
+        # One RESULT:/ERROR: line per job, in submission order; a crash
+        # leaves the remaining jobs without a line
+        start = time.perf_counter()
+        if self._worker is not None:
+            lines, log = self._batch_in_worker(ordered, timeout * len(jobs))
+        else:
+            result = subprocess.run(
+                [str(self.binary_path), "--batch"],
+                input="".join(_job_line(job) for job in ordered),
+                capture_output=True,
+                text=True,
+                timeout=timeout * len(jobs),
+                cwd=self._project_root,
+            )
+            lines = [
+                line
+                for line in result.stdout.splitlines()
+                if line.startswith(("RESULT:", "ERROR:"))
+            ]
+            log = result.stderr
+        elapsed = time.perf_counter() - start
+
+        results: List[Optional[RenderResult]] = [None] * len(jobs)
+        for position, i in enumerate(order):
+            line = lines[position] if position < len(lines) else ""
+            non_white, total = self._parse_pixel_counts(line)
+            output_path = jobs[i].output_path
+            results[i] = RenderResult(
+                success=line.startswith("RESULT:"),
+                output_path=(
+                    output_path if isinstance(output_path, Path) else Path(output_path)
+                ),
+                stdout=line,
+                stderr=log,
+                render_time=elapsed / len(jobs),
+                non_white_pixels=non_white,
+                total_pixels=total,
+            )
+        return results
+
+    @property
+    def _project_root(self) -> Path:
+        """Project root; render_tile runs there so shader files can be found."""
+        return self.binary_path.parent.parent.parent.parent
+
     def _parse_pixel_counts(self, stdout: str) -> tuple[int, int]:
         """
         Extract pixel counts from stdout.
@@ -120,9 +424,9 @@ class RenderTileRunner:
         Returns:
             (non_white_pixels, total_pixels)
         """
-        # Try to find the RESULT line
-        pattern = r"RESULT:\s+(\d+)\s+non-white pixels\s+/\s+(\d+)\s+total"
-        match = re.search(pattern, stdout)
+        # Try to find the RESULT line, skipping the log text before it
+        start = stdout.find("RESULT:")
+        match = _RESULT_PATTERN.search(stdout, start) if start >= 0 else None
 
         if match:
             non_white = int(match.group(1))
@@ -133,7 +437,7 @@ class RenderTileRunner:
         return 0, 256 * 256
 
 
-def find_render_tile_binary() -> Path:
+def find_render_tile_binary(project_root: Optional[Path] = None) -> Path:
     """
     Locate the render_tile binary in the project.
 
@@ -141,14 +445,28 @@ def find_render_tile_binary() -> Path:
     1. target/release/examples/render_tile
     2. target/debug/examples/render_tile
 
+    Successful lookups are cached per project root.
+
+    Args:
+        project_root: Project root to search (default: inferred from this file)
+
     Returns:
         Path to the binary
 
     Raises:
         FileNotFoundError: If binary is not found in any location
     """
-    # Get project root (3 levels up from this file)
-    project_root = Path(__file__).parent.parent.parent
+    if project_root is None:
+        # Get project root (3 levels up from this file)
+        project_root = Path(__file__).parent.parent.parent
+
+    return _find_render_tile_binary(str(project_root))
+
+
+@functools.lru_cache(maxsize=None)
+def _find_render_tile_binary(project_root: str) -> Path:
+    """Search a project root for render_tile; see find_render_tile_binary."""
+    project_root = Path(project_root)
 
     candidates = [
         project_root / "target" / "release" / "examples" / "render_tile",